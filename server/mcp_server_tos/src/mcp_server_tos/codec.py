@@ -0,0 +1,22 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 导入时选择一次 base64 实现：优先使用 pybase64（运行时按 CPU 选择 SSSE3/AVX2/AVX-512/NEON 实现），
+# 未安装时回退到标准库 base64
+try:
+    import pybase64 as _b64lib
+
+    B64_BACKEND = "pybase64"
+    b64encode_str = _b64lib.b64encode_as_string
+    b64decode = _b64lib.b64decode
+except ImportError:
+    import base64 as _b64lib
+
+    B64_BACKEND = "base64"
+    b64decode = _b64lib.b64decode
+
+    def b64encode_str(data) -> str:
+        return _b64lib.b64encode(data).decode('ascii')
+
+logger.debug(f"Using {B64_BACKEND} as base64 backend")
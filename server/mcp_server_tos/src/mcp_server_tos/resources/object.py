@@ -1,13 +1,27 @@
-import base64
+import asyncio
 import logging
 from typing import Optional
 import json
 
+from mcp_server_tos.codec import b64encode_str
 from mcp_server_tos.config import TosConfig
 from mcp_server_tos.resources.service import TosResource
 
 logger = logging.getLogger(__name__)
 
+_TEXT_EXTENSIONS = (
+    '.txt', '.log', '.json', '.xml', '.yml', '.yaml', '.md',
+    '.csv', '.ini', '.conf', '.py', '.js', '.html', '.css',
+    '.sh', '.bash', '.cfg', '.properties'
+)
+_MAX_TEXT_EXTENSION_LEN = max(len(ext) for ext in _TEXT_EXTENSIONS)
+
+# 下载分片大小，1 MiB 可显著减少大对象下载时 Python 层的迭代次数
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 超过该大小的数据块放到线程中做 base64 编码，避免长时间占用事件循环
+_OFFLOAD_ENCODE_THRESHOLD = 256 * 1024
+
 
 class ObjectResource(TosResource):
     """
@@ -28,29 +42,8 @@ class ObjectResource(TosResource):
         Returns:
             对象内容
         """
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
-
-        response = None
-        try:
-            response = await self.get(bucket=bucket_name, key=key)
-            if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
-
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
-
-                if is_text_file(key):
-                    return content.decode('utf-8')
-                else:
-                    return base64.b64encode(content).decode()
-            else:
-                raise Exception(f"get object failed, tos server return: {response.json()}")
-        finally:
-            if response is not None:
-                await response.aclose()
+        return await self._download(bucket=bucket_name, key=key, as_text=is_text_file(key),
+                                    action="get object")
 
     async def video_info(self, bucket_name: str, key: str) -> str:
         """
@@ -64,27 +57,8 @@ class ObjectResource(TosResource):
         """
 
         query = {"x-tos-process": "video/info"}
-
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
-
-        response = None
-        try:
-            response = await self.get(bucket=bucket_name, key=key, params=query)
-            if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
-
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
-
-                return content.decode('utf-8')
-            else:
-                raise Exception(f"get video info failed, tos server return: {response.json()}")
-        finally:
-            if response is not None:
-                await response.aclose()
+        return await self._download(bucket=bucket_name, key=key, params=query, as_text=True,
+                                    action="get video info")
 
     async def video_snapshot(self, bucket_name: str, key: str, time: Optional[int] = None,
                              width: Optional[int] = None, height: Optional[int] = None, mode: Optional[str] = None,
@@ -115,57 +89,75 @@ class ObjectResource(TosResource):
             如果指定了saveas参数，则返回转存后的对象信息，json格式；否则返回截帧后的图片文件，jpg或png格式，base64编码
         """
 
-        params = {}
+        process_params = ["video/snapshot"]
         if time is not None:
-            params["t"] = time
+            process_params.append(f"t_{time}")
         if width is not None:
-            params["w"] = width
+            process_params.append(f"w_{width}")
         if height is not None:
-            params["h"] = height
+            process_params.append(f"h_{height}")
         if mode is not None:
-            params["m"] = mode
+            process_params.append(f"m_{mode}")
         if output_format is not None:
-            params["f"] = output_format
+            process_params.append(f"f_{output_format}")
         if auto_rotate is not None:
-            params["ar"] = auto_rotate
+            process_params.append(f"ar_{auto_rotate}")
 
-        if len(params) > 0:
-            query = {"x-tos-process": "video/snapshot" + "".join(
-                f",{k}_{v}" for k, v in params.items() if v is not None
-            )}
-        else:
-            query = {"x-tos-process": "video/snapshot"}
+        query = {"x-tos-process": ','.join(process_params)}
 
         if saveas_object:
-            query["x-tos-save-object"] = base64.b64encode(saveas_object.encode('utf-8')).decode('ascii')
+            query["x-tos-save-object"] = b64encode_str(saveas_object.encode())
         if saveas_bucket:
-            query["x-tos-save-bucket"] = base64.b64encode(saveas_bucket.encode('utf-8')).decode('ascii')
+            query["x-tos-save-bucket"] = b64encode_str(saveas_bucket.encode())
 
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
+        return await self._download(bucket=bucket_name, key=key, params=query, as_text=bool(saveas_object),
+                                    action="get video snapshot")
 
+    async def _download(self, *, bucket: str, key: str, params: Optional[dict] = None, as_text: bool,
+                        action: str) -> str:
+        """
+        以流式方式下载对象（或数据处理结果），校验大小后按 UTF-8 解码或 base64 编码返回
+        Args:
+            bucket: 存储桶名称
+            key: 对象名称
+            params: 请求查询参数，如 x-tos-process
+            as_text: 为 True 时按 UTF-8 文本返回，否则返回 base64 编码
+            action: 操作名称，用于错误信息
+        Returns:
+            文本内容或 base64 编码后的内容
+        """
         response = None
         try:
-            response = await self.get(bucket=bucket_name, key=key, params=query)
+            response = await self.get(bucket=bucket, key=key, params=params, stream=True)
             if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
-
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
-
-                if saveas_object:
-                    return content.decode('utf-8')
+                too_large_message = \
+                    f"Bucket: {bucket} object: {key} is too large, more than {self.max_object_size} bytes"
+                content_length_header = response.headers.get('content-length')
+                content_length = int(content_length_header) if content_length_header else 0
+                if content_length > self.max_object_size:
+                    raise Exception(too_large_message)
+
+                if 0 < content_length <= _DOWNLOAD_CHUNK_SIZE:
+                    # 小对象一次性读取，跳过异步分片迭代
+                    content = await response.aread()
+                    if len(content) > self.max_object_size:
+                        raise Exception(too_large_message)
+                    return content.decode('utf-8') if as_text else await _b64encode(content)
+
+                # 无 content-length（如 chunked 编码的数据处理结果）时，由读取过程按累计字节数限制大小
+                if as_text:
+                    return await _read_as_text(response, _DOWNLOAD_CHUNK_SIZE, self.max_object_size,
+                                               too_large_message)
                 else:
-                    return base64.b64encode(content).decode()
+                    return await _read_as_base64(response, _DOWNLOAD_CHUNK_SIZE, self.max_object_size,
+                                                 too_large_message)
             else:
-                raise Exception(f"get video snapshot failed, tos server return: {response.json()}")
+                await response.aread()
+                raise Exception(f"{action} failed, tos server return: {response.json()}")
         finally:
             if response is not None:
                 await response.aclose()
 
-
     async def text_to_image(self, task_type: str, input_data_source: dict, output_processing: dict, ai_model_config: dict):
         """
         调用 TOS TextToImage 接口，使用文生图模型生成图片
@@ -353,11 +345,53 @@ class ObjectResource(TosResource):
                 await response.aclose()
 
 
+async def _b64encode(data) -> str:
+    """base64 编码，较大的数据块放到线程中执行"""
+    if len(data) >= _OFFLOAD_ENCODE_THRESHOLD:
+        # pybase64 编码期间会释放 GIL，其他请求可在事件循环上继续执行
+        return await asyncio.to_thread(b64encode_str, data)
+    return b64encode_str(data)
+
+
+async def _read_as_text(response, chunk_size: int, max_size: int, too_large_message: str) -> str:
+    """收集响应分片后一次性拼接并按 UTF-8 解码，避免 bytearray 逐段扩容；累计超过 max_size 时抛出异常"""
+    chunks: list[bytes] = []
+    total = 0
+    async for chunk in response.aiter_bytes(chunk_size):
+        total += len(chunk)
+        if total > max_size:
+            raise Exception(too_large_message)
+        chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8')
+
+
+async def _read_as_base64(response, chunk_size: int, max_size: int, too_large_message: str) -> str:
+    """边下载边做 base64 编码，按 3 字节对齐分段编码，避免同时持有完整原文和编码结果；累计超过 max_size 时抛出异常"""
+    encoded = []
+    tail = b''
+    total = 0
+    async for chunk in response.aiter_bytes(chunk_size):
+        total += len(chunk)
+        if total > max_size:
+            raise Exception(too_large_message)
+        view = memoryview(chunk)
+        if tail:
+            # 先用本分片开头的字节补齐上一分片遗留的不足 3 字节部分，避免拼接整个分片产生拷贝
+            need = 3 - len(tail)
+            if len(view) < need:
+                tail += chunk
+                continue
+            encoded.append(b64encode_str(tail + view[:need]))
+            view = view[need:]
+        aligned = len(view) // 3 * 3
+        encoded.append(await _b64encode(view[:aligned]))
+        tail = bytes(view[aligned:])
+    if tail:
+        encoded.append(b64encode_str(tail))
+    return ''.join(encoded)
+
+
 def is_text_file(key: str) -> bool:
     """Determine if a file is text-based by its extension"""
-    text_extensions = {
-        '.txt', '.log', '.json', '.xml', '.yml', '.yaml', '.md',
-        '.csv', '.ini', '.conf', '.py', '.js', '.html', '.css',
-        '.sh', '.bash', '.cfg', '.properties'
-    }
-    return any(key.lower().endswith(ext) for ext in text_extensions)
+    # 只对末尾若干字符做小写转换，避免为长 key 复制整个字符串
+    return key.endswith(_TEXT_EXTENSIONS) or key[-_MAX_TEXT_EXTENSION_LEN:].lower().endswith(_TEXT_EXTENSIONS)
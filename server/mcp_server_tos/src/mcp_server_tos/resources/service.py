@@ -48,7 +48,10 @@ class TosResource:
         return []
 
     async def get(self, bucket: str, key: str = None, headers: Dict[str, str] = None,
-                  params: Dict[str, str] = None):
+                  params: Dict[str, str] = None, stream: bool = False):
+        """
+        stream 为 True 时仅读取响应头即返回，响应体需由调用方通过 aiter_bytes/aread 读取并负责 aclose
+        """
         if key is not None:
             _is_valid_object_name(key)
 
@@ -65,9 +68,9 @@ class TosResource:
         attempt = 0
         while attempt < 3:
             try:
-                response = await _global_client.get(sign_out.signed_url, follow_redirects=False,
-                                                    headers=headers, params=params,
-                                                    timeout=httpx.Timeout(connect=10, read=30, write=10, pool=10))
+                request = _global_client.build_request("GET", sign_out.signed_url, headers=headers, params=params,
+                                                       timeout=httpx.Timeout(connect=10, read=30, write=10, pool=10))
+                response = await _global_client.send(request, stream=stream, follow_redirects=False)
                 if response.status_code >= 500 or response.status_code == 429:
                     await response.aclose()
                     attempt += 1
@@ -1,13 +1,15 @@
-import base64
-import json
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
+import orjson
+
 from mcp.server.session import ServerSession
 from mcp.server.fastmcp import Context, FastMCP
 from starlette.requests import Request
 
+from mcp_server_tos.codec import b64decode
 from mcp_server_tos.config import TosConfig, TOS_CONFIG, LOCAL_DEPLOY_MODE
 from mcp_server_tos.credential import Credential
 from mcp_server_tos.resources.bucket import BucketResource
@@ -19,7 +21,7 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("TOS MCP Server", host=os.getenv("MCP_SERVER_HOST", "127.0.0.1"), port=int(os.getenv("PORT", "8000")))
 
 
-def get_credential_from_request():
+def get_auth_from_request() -> str:
     ctx: Context[ServerSession, object] = mcp.get_context()
     raw_request: Request | None = ctx.request_context.request
 
@@ -33,16 +35,22 @@ def get_credential_from_request():
     if auth is None:
         # 获取认证信息失败
         raise ValueError("Missing authorization info.")
+    return auth
+
 
+@lru_cache(maxsize=128)
+def _credential_from_auth(auth: str) -> Credential:
+    # 同一会话内的连续工具调用通常携带相同的 authorization，按原始字符串缓存解析结果
     if ' ' in auth:
         _, base64_data = auth.split(' ', 1)
     else:
         base64_data = auth
+    # 严格校验前去掉空白字符，兼容 `base64` 命令等按 76 字符换行输出的编码结果
+    base64_data = ''.join(base64_data.split())
 
     try:
-        # 解码 Base64
-        decoded_str = base64.b64decode(base64_data).decode('utf-8')
-        data = json.loads(decoded_str)
+        # 解码 Base64，orjson 直接解析 bytes，省去中间的 UTF-8 解码
+        data = orjson.loads(b64decode(base64_data, validate=True))
         # 获取字段
         current_time = data.get('CurrentTime')
         expired_time = data.get('ExpiredTime')
@@ -58,10 +66,15 @@ def get_credential_from_request():
         raise
 
 
+def get_credential_from_request():
+    return _credential_from_auth(get_auth_from_request())
+
+
 def get_tos_config() -> TosConfig:
     if TOS_CONFIG.deploy_mode == LOCAL_DEPLOY_MODE:
         return TOS_CONFIG
     else:
+        # 仅缓存不可变的 Credential，TosConfig 每次调用单独构造，避免跨请求共享可变对象
         credential = get_credential_from_request()
         return TosConfig(
             access_key=credential.access_key,